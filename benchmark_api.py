@@ -0,0 +1,478 @@
+#!/usr/bin/env python
+"""
+IoT Analytics - Benchmark Harness
+Times dataset loading and REST endpoint latency and writes JSON results
+
+Usage:
+    python benchmark_api.py --rows 10000 100000 1000000
+    python benchmark_api.py --rows 100000 --concurrency 8 --requests 200
+    python benchmark_api.py --compare bench_pandas.json bench_pyspark.json
+
+The backend (pandas or PySpark) is whatever SparkService.create() selects in
+the current environment, so run once per environment and use --compare to
+diff the two result files. The same mode tracks regressions between versions.
+
+Backend timings and memory are measured in a fresh subprocess per dataset so
+each size is isolated from the app import and from earlier sizes. Memory
+includes child processes (the Spark JVM) when psutil is installed; without it
+a backend with child processes reports memory as unavailable.
+
+Endpoints are timed after switching the app to the dataset via
+POST /set_dataset. The app's payload is not documented, so the harness
+assumes {"dataset": "<file in data/>"} and that /info returns the row count
+under "rows"; override with --dataset-key / --rows-key. A mismatch aborts the
+run rather than timing the wrong dataset. Per-sensor endpoints use the first
+sensor returned by /sensors.
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import threading
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from urllib.request import urlopen
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+DATA_DIR = project_root / 'data'
+GENERATOR = DATA_DIR / 'generate_dataset.py'
+
+ENDPOINTS = [
+    '/health',
+    '/info',
+    '/datasets',
+    '/sensors',
+    '/summary',
+    '/anomalies',
+    '/data',
+]
+
+# {id} is filled with the first sensor from /sensors
+SENSOR_ENDPOINTS = [
+    '/sensor/{id}',
+    '/data?sensor_id={id}',
+    '/anomalies?sensor_id={id}',
+]
+
+# Metrics compare() diffs besides anything ending in _ms, _s or _mb
+COMPARED_METRICS = ('throughput_rps', 'errors')
+
+MB = 1024 * 1024
+
+
+def rss_mb():
+    """(current, peak) resident set size of this process in MB, None if unavailable"""
+    try:
+        # VmHWM starts fresh at exec, unlike ru_maxrss which Linux carries over
+        with open('/proc/self/status') as f:
+            status = dict(line.split(':', 1) for line in f if ':' in line)
+        return (round(int(status['VmRSS'].split()[0]) * 1024 / MB, 1),
+                round(int(status['VmHWM'].split()[0]) * 1024 / MB, 1))
+    except (OSError, KeyError, ValueError):
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        peak = getattr(info, 'peak_wset', None)
+        return (round(info.rss / MB, 1),
+                round(peak / MB, 1) if peak else None)
+    except ImportError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS and kilobytes elsewhere
+        return None, round(peak / (MB if sys.platform == 'darwin' else 1024), 1)
+    except ImportError:
+        return None, None
+
+
+def child_pids():
+    """PIDs of this process's children from /proc (empty if unavailable)"""
+    pids = []
+    for children in Path('/proc/self/task').glob('*/children'):
+        try:
+            pids.extend(int(pid) for pid in children.read_text().split())
+        except (OSError, ValueError):
+            pass
+    return pids
+
+
+def process_tree_rss_mb():
+    """RSS of this process plus all its children in MB
+
+    Returns None when there are children (e.g. the Spark JVM) that cannot be
+    measured because psutil is not installed.
+    """
+    try:
+        import psutil
+    except ImportError:
+        if child_pids():
+            return None
+        current, _ = rss_mb()
+        return current
+
+    process = psutil.Process()
+    total = process.memory_info().rss
+    for child in process.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return round(total / MB, 1)
+
+
+class MemorySampler:
+    """Tracks peak RSS of the process tree by polling while the block runs"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.before = None
+        self.peak = None
+        self.unavailable = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='rss-sampler', daemon=True)
+
+    def _sample(self):
+        value = process_tree_rss_mb()
+        if value is None:
+            self.unavailable = True
+        elif self.peak is None or value > self.peak:
+            self.peak = value
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.before = process_tree_rss_mb()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        # Short-lived peaks between polls are caught by VmHWM for this process
+        _, own_peak = rss_mb()
+        if own_peak is not None and self.peak is not None:
+            self.peak = max(self.peak, own_peak)
+
+    def result(self):
+        if self.unavailable or self.before is None or self.peak is None:
+            return {'rss_before_mb': None, 'peak_rss_mb': None, 'dataset_rss_mb': None}
+        return {
+            'rss_before_mb': self.before,
+            'peak_rss_mb': self.peak,
+            'dataset_rss_mb': round(self.peak - self.before, 1),
+        }
+
+
+def percentiles(samples_ms):
+    """p50/p95/p99/mean/max of a list of millisecond timings"""
+    if not samples_ms:
+        return {}
+    ordered = sorted(samples_ms)
+
+    def pick(p):
+        index = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        return round(ordered[index], 3)
+
+    return {
+        'count': len(ordered),
+        'p50_ms': pick(50),
+        'p95_ms': pick(95),
+        'p99_ms': pick(99),
+        'mean_ms': round(sum(ordered) / len(ordered), 3),
+        'max_ms': round(ordered[-1], 3),
+    }
+
+
+def ensure_dataset(rows, sensors, seed):
+    """Generate data/bench_<rows>_<sensors>s_seed<seed>.csv if missing"""
+    name = f'bench_{rows}_{sensors}s_seed{seed}.csv'
+    path = DATA_DIR / name
+    if not path.exists():
+        print(f"  Generating {name} ({rows:,} rows)...")
+        subprocess.run(
+            [sys.executable, str(GENERATOR),
+             '--rows', str(rows), '--sensors', str(sensors), '--seed', str(seed), '--out', name],
+            cwd=str(project_root), check=True,
+        )
+    return path
+
+
+def bench_backend(path):
+    """Time SparkService load_csv / summary_json / detect_anomalies (in-process)"""
+    from app.spark_service import SparkService
+
+    service = SparkService.create()
+    result = {'backend': type(service).__name__}
+
+    with MemorySampler() as memory:
+        start = time.perf_counter()
+        service.load_csv(str(path))
+        result['load_s'] = round(time.perf_counter() - start, 3)
+
+        for name in ('summary_json', 'detect_anomalies'):
+            start = time.perf_counter()
+            getattr(service, name)()
+            result[f'{name}_s'] = round(time.perf_counter() - start, 3)
+
+    result.update(memory.result())
+    del service
+    return result
+
+
+def bench_backend_isolated(path):
+    """Run bench_backend in a fresh interpreter so memory is per dataset"""
+    proc = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), '--backend-only', str(path)],
+        cwd=str(project_root), capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"Backend benchmark for {path.name} failed "
+                         f"(exit {proc.returncode}):\n{proc.stderr.strip()}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def switch_dataset(client, path, rows, dataset_key, rows_key):
+    """Load path into the app through POST /set_dataset and verify via /info"""
+    r = client.post('/set_dataset', json={dataset_key: path.name})
+    if r.status_code != 200:
+        raise SystemExit(f"POST /set_dataset {{'{dataset_key}': '{path.name}'}} failed "
+                         f"[{r.status_code}]: {r.get_data(as_text=True)[:200]}")
+    info = client.get('/info').get_json() or {}
+    if info.get(rows_key) != rows:
+        raise SystemExit(f"/info['{rows_key}'] is {info.get(rows_key)!r} after switching to "
+                         f"{path.name}, expected {rows} - endpoint timings would be mislabeled "
+                         f"(see --dataset-key / --rows-key)")
+    return info
+
+
+def resolve_endpoints(client):
+    """(label, path) pairs to time, with per-sensor paths for the first sensor"""
+    r = client.get('/sensors')
+    sensors = (r.get_json() or {}).get('sensors') if r.status_code == 200 else None
+    if not sensors:
+        raise SystemExit(f"GET /sensors returned no sensors [{r.status_code}] - "
+                         f"cannot time per-sensor endpoints")
+    first = sensors[0]
+    sensor_id = first['sensor_id'] if isinstance(first, dict) else first
+    endpoints = [(endpoint, endpoint) for endpoint in ENDPOINTS]
+    endpoints += [(template.replace('{id}', '<id>'), template.format(id=quote(str(sensor_id))))
+                  for template in SENSOR_ENDPOINTS]
+    return endpoints
+
+
+def bench_test_client(app, endpoints, repeat):
+    """Sequential latency of each endpoint through app.test_client()"""
+    results = {}
+    with app.test_client() as client:
+        for label, endpoint in endpoints:
+            timings = []
+            status = None
+            size = 0
+            for _ in range(repeat):
+                start = time.perf_counter()
+                r = client.get(endpoint)
+                timings.append((time.perf_counter() - start) * 1000)
+                status = r.status_code
+                size = len(r.data)
+            results[label] = dict(percentiles(timings), status=status, bytes=size)
+            print(f"  {label:<26} p50={results[label]['p50_ms']:>9.2f}ms  "
+                  f"p99={results[label]['p99_ms']:>9.2f}ms  [{status}]")
+    return results
+
+
+def start_waitress(app):
+    """Serve app on an ephemeral port in a background thread"""
+    import logging
+    from waitress.server import create_server
+
+    # Queue depth warnings are expected when concurrency exceeds the thread count
+    logging.getLogger('waitress.queue').setLevel(logging.ERROR)
+    server = create_server(app, host='127.0.0.1', port=0, threads=4)
+    thread = threading.Thread(target=server.run, name='waitress', daemon=True)
+    thread.start()
+    return server, thread
+
+
+def stop_waitress(server, thread):
+    """Drain task threads, then close every socket from the loop thread and join it"""
+    server.task_dispatcher.shutdown()
+
+    def close_all():
+        # Closing from the loop thread avoids pulling fds out from under select()
+        for dispatcher in list(server._map.values()):
+            dispatcher.close()
+
+    server.trigger.pull_trigger(close_all)
+    thread.join(timeout=10)
+
+
+def bench_waitress(port, endpoints, concurrency, total_requests):
+    """Concurrent latency of each endpoint against the local waitress server"""
+    def fetch(url):
+        start = time.perf_counter()
+        with urlopen(url, timeout=120) as response:
+            response.read()
+        return (time.perf_counter() - start) * 1000
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for label, endpoint in endpoints:
+            url = f'http://127.0.0.1:{port}{endpoint}'
+            errors = 0
+            timings = []
+            start = time.perf_counter()
+            for future in [pool.submit(fetch, url) for _ in range(total_requests)]:
+                try:
+                    timings.append(future.result())
+                except Exception:
+                    errors += 1
+            elapsed = time.perf_counter() - start
+            results[label] = dict(
+                percentiles(timings),
+                errors=errors,
+                throughput_rps=round(len(timings) / elapsed, 1) if elapsed else None,
+            )
+            print(f"  {label:<26} p95={results[label].get('p95_ms', 0):>9.2f}ms  "
+                  f"{results[label]['throughput_rps']} req/s  errors={errors}")
+    return results
+
+
+def compare(baseline_file, candidate_file):
+    """Print per-metric deltas between two result files"""
+    with open(baseline_file) as f:
+        baseline = json.load(f)
+    with open(candidate_file) as f:
+        candidate = json.load(f)
+
+    print(f"\nBaseline:  {baseline_file} ({baseline.get('backend')})")
+    print(f"Candidate: {candidate_file} ({candidate.get('backend')})\n")
+
+    for rows, base_run in baseline.get('runs', {}).items():
+        cand_run = candidate.get('runs', {}).get(rows)
+        if not cand_run:
+            continue
+        print(f"--- {int(rows):,} rows ---")
+        for section in ('backend', 'test_client', 'waitress'):
+            base_section = base_run.get(section) or {}
+            cand_section = cand_run.get(section) or {}
+            if section == 'backend':
+                base_section = {'': base_section}
+                cand_section = {'': cand_section}
+            for key, base_metrics in base_section.items():
+                for metric, base_value in base_metrics.items():
+                    cand_value = (cand_section.get(key) or {}).get(metric)
+                    if not isinstance(base_value, (int, float)) or not isinstance(cand_value, (int, float)):
+                        continue
+                    if not (metric.endswith(('_ms', '_s', '_mb')) or metric in COMPARED_METRICS):
+                        continue
+                    if base_value:
+                        change = f"{(cand_value - base_value) / base_value * 100:+.1f}%"
+                    else:
+                        change = 'new' if cand_value else '+0.0%'
+                    print(f"  {section:<12} {key:<26} {metric:<22} "
+                          f"{base_value:>10} -> {cand_value:<10} ({change})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the IoT analytics API and backends')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help='Dataset sizes to benchmark (e.g. 10000 100000 1000000 10000000)')
+    parser.add_argument('--sensors', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=20,
+                        help='Sequential requests per endpoint through app.test_client()')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=100,
+                        help='Concurrent requests per endpoint against waitress (0 to skip)')
+    parser.add_argument('--dataset-key', default='dataset',
+                        help='JSON key for the file name in the POST /set_dataset body')
+    parser.add_argument('--rows-key', default='rows',
+                        help='Key of the row count in the GET /info response')
+    parser.add_argument('--out', default=None, help='Result file (default: bench_<backend>_<time>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CANDIDATE'))
+    parser.add_argument('--backend-only', metavar='CSV', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    if args.backend_only:
+        print(json.dumps(bench_backend(Path(args.backend_only))))
+        return
+
+    print("\n" + "="*70)
+    print("IoT Analytics - Benchmark")
+    print("="*70)
+
+    start = time.perf_counter()
+    from app.main import app
+    import_s = round(time.perf_counter() - start, 3)
+    print(f"\napp.main imported in {import_s}s")
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'import_s': import_s,
+        'runs': {},
+    }
+
+    waitress = None
+    if args.requests:
+        try:
+            waitress = start_waitress(app)
+        except ImportError:
+            print("waitress not installed - concurrent runs skipped")
+
+    try:
+        for rows in args.rows:
+            print(f"\n[{rows:,} rows]")
+            path = ensure_dataset(rows, args.sensors, args.seed)
+            run = {'dataset': str(path.relative_to(project_root))}
+
+            print("  SparkService load/summary/anomalies (subprocess)...")
+            run['backend'] = bench_backend_isolated(path)
+            report['backend'] = run['backend']['backend']
+            print(f"  {json.dumps(run['backend'])}")
+
+            with app.test_client() as client:
+                switch_dataset(client, path, rows, args.dataset_key, args.rows_key)
+                endpoints = resolve_endpoints(client)
+
+            print("  test_client latency:")
+            run['test_client'] = bench_test_client(app, endpoints, args.repeat)
+
+            if waitress:
+                print(f"  waitress latency ({args.concurrency} concurrent):")
+                run['waitress'] = bench_waitress(
+                    waitress[0].effective_port, endpoints, args.concurrency, args.requests)
+
+            report['runs'][str(rows)] = run
+    finally:
+        if waitress:
+            stop_waitress(*waitress)
+
+    out = args.out or f"bench_{report.get('backend', 'unknown')}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(out, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print("\n" + "="*70)
+    print(f"Results written to {out}")
+    print("="*70 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+"""
+IoT Sensor Dataset Generator
+Builds synthetic sensor logs with vectorized NumPy, sharded across processes
+
+Usage:
+    python data/generate_dataset.py --rows 100000 --sensors 200 --out sensor_data_100k.csv
+    python data/generate_dataset.py --rows 10000000 --sensors 500 --out sensor_data_10m.parquet
+    python data/generate_dataset.py --rows 1000000 --out faults_1m.csv.gz --labels \\
+        --spike-rate 0.002 --drift-rate 0.05 --stuck-rate 0.05 --dropout-rate 0.001
+
+Output columns: sensor_id, timestamp, value, status (+ fault_type with --labels).
+Rows are split into fixed-size shards seeded from (seed, shard index), so the
+output is identical for a given seed and --shard-rows whatever --workers is.
+Relative --out paths are written next to this script (the data/ folder).
+"""
+
+import os
+import sys
+import gzip
+import shutil
+import argparse
+import importlib.util
+import tempfile
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = Path(__file__).parent
+
+# Index in this tuple is the fault code stored per row
+FAULT_TYPES = ('none', 'spike', 'drift', 'stuck', 'dropout')
+SPIKE, DRIFT, STUCK, DROPOUT = 1, 2, 3, 4
+
+
+def detect_format(out, fmt):
+    """Output format from --format or the file extension"""
+    if fmt:
+        return fmt
+    name = out.name.lower()
+    if name.endswith('.parquet'):
+        return 'parquet'
+    if name.endswith('.gz'):
+        return 'csv.gz'
+    return 'csv'
+
+
+def build_plan(args):
+    """Per-sensor parameters shared by every shard, drawn from the master seed"""
+    rng = np.random.default_rng(args.seed)
+    sensors = args.sensors
+    steps = max(1, -(-args.rows // sensors))
+
+    baseline = rng.uniform(20.0, 80.0, sensors)
+    noise = rng.uniform(0.5, 2.0, sensors)
+    stuck_min = max(1, steps // 50)
+    stuck_max = max(stuck_min + 1, steps // 10)
+    width = max(3, len(str(sensors)))
+
+    return {
+        'sensors': sensors,
+        'names': np.array([f'sensor_{i + 1:0{width}d}' for i in range(sensors)]),
+        'baseline': baseline,
+        'noise': noise,
+        'drifting': rng.random(sensors) < args.drift_rate,
+        'drift_start': rng.integers(0, steps, sensors),
+        'drift_slope': rng.uniform(0.01, 0.05, sensors) * noise * rng.choice([-1.0, 1.0], sensors),
+        'stuck': rng.random(sensors) < args.stuck_rate,
+        'stuck_start': rng.integers(0, steps, sensors),
+        'stuck_len': rng.integers(stuck_min, stuck_max + 1, sensors),
+        'stuck_value': baseline + rng.standard_normal(sensors) * noise,
+    }
+
+
+def generate_shard(shard, start, stop, plan, args, text_timestamps=False):
+    """Rows [start, stop) as a DataFrame (ISO timestamp strings if text_timestamps)"""
+    rng = np.random.default_rng([args.seed, shard])
+    n = stop - start
+
+    row = np.arange(start, stop, dtype=np.int64)
+    sensor = row % plan['sensors']
+    step = row // plan['sensors']
+
+    noise = plan['noise'][sensor]
+    values = plan['baseline'][sensor] + rng.standard_normal(n) * noise
+    fault = np.zeros(n, dtype=np.int8)
+
+    # Drift: linear ramp from a per-sensor start step onwards
+    since = step - plan['drift_start'][sensor]
+    mask = plan['drifting'][sensor] & (since >= 0)
+    values[mask] += plan['drift_slope'][sensor[mask]] * since[mask]
+    fault[mask] = DRIFT
+
+    # Stuck: sensor repeats one value for a window of steps
+    offset = step - plan['stuck_start'][sensor]
+    mask = plan['stuck'][sensor] & (offset >= 0) & (offset < plan['stuck_len'][sensor])
+    values[mask] = plan['stuck_value'][sensor[mask]]
+    fault[mask] = STUCK
+
+    # Spikes: isolated readings 6-10 sigma away
+    mask = rng.random(n) < args.spike_rate
+    count = int(mask.sum())
+    values[mask] += rng.choice([-1.0, 1.0], count) * rng.uniform(6.0, 10.0, count) * noise[mask]
+    fault[mask] = SPIKE
+
+    # Dropouts: the reading is missing (empty value)
+    mask = rng.random(n) < args.dropout_rate
+    values[mask] = np.nan
+    fault[mask] = DROPOUT
+
+    timestamps = np.datetime64(args.start, 's') + step * np.timedelta64(args.interval, 's')
+    if text_timestamps:
+        # One vectorized conversion; to_csv(date_format=...) formats row by row
+        timestamps = np.datetime_as_string(timestamps, unit='s')
+
+    frame = pd.DataFrame({
+        'sensor_id': plan['names'][sensor],
+        'timestamp': timestamps,
+        'value': np.round(values, 2),
+        'status': np.where(fault > 0, 'fault', 'normal'),
+    })
+    if args.labels:
+        frame['fault_type'] = np.array(FAULT_TYPES)[fault]
+    return frame
+
+
+def write_shard(shard, start, stop, plan, args, fmt, part):
+    """Generate one shard and write it to its part file (runs in a worker)"""
+    frame = generate_shard(shard, start, stop, plan, args, text_timestamps=fmt != 'parquet')
+    if fmt == 'parquet':
+        frame.to_parquet(part, index=False)
+    else:
+        frame.to_csv(
+            part,
+            index=False,
+            header=False,
+            float_format='%.2f',
+            compression='gzip' if fmt == 'csv.gz' else None,
+        )
+    return len(frame)
+
+
+def merge_parts(parts, out, fmt, columns):
+    """Concatenate shard files into the final output"""
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for part in parts:
+                table = pq.read_table(part)
+                if writer is None:
+                    writer = pq.ParquetWriter(out, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return
+
+    header = (','.join(columns) + '\n').encode()
+    with open(out, 'wb') as f:
+        # Concatenated gzip members form a valid gzip stream
+        f.write(gzip.compress(header) if fmt == 'csv.gz' else header)
+        for part in parts:
+            with open(part, 'rb') as src:
+                shutil.copyfileobj(src, f, 1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic IoT sensor dataset')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--sensors', type=int, default=200)
+    parser.add_argument('--out', default='sensor_data_100k.csv',
+                        help='Output file (.csv, .csv.gz or .parquet); relative paths go in data/')
+    parser.add_argument('--format', choices=['csv', 'csv.gz', 'parquet'], default=None,
+                        help='Output format (default: from --out extension)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--start', default='2025-11-04T00:00:00', help='First timestamp')
+    parser.add_argument('--interval', type=int, default=60, help='Seconds between readings per sensor')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--shard-rows', type=int, default=1000000)
+    parser.add_argument('--spike-rate', type=float, default=0.002,
+                        help='Fraction of readings with a spike')
+    parser.add_argument('--drift-rate', type=float, default=0.0,
+                        help='Fraction of sensors that drift')
+    parser.add_argument('--stuck-rate', type=float, default=0.0,
+                        help='Fraction of sensors that get stuck for a window')
+    parser.add_argument('--dropout-rate', type=float, default=0.0,
+                        help='Fraction of readings that are missing')
+    parser.add_argument('--labels', action='store_true',
+                        help='Add a fault_type ground-truth column')
+    args = parser.parse_args()
+
+    if args.rows <= 0 or args.sensors <= 0 or args.shard_rows <= 0:
+        parser.error('--rows, --sensors and --shard-rows must be positive')
+
+    out = Path(args.out)
+    if not out.is_absolute():
+        out = DATA_DIR / out
+    out.parent.mkdir(parents=True, exist_ok=True)
+    fmt = detect_format(out, args.format)
+    if fmt == 'parquet' and importlib.util.find_spec('pyarrow') is None:
+        parser.error('parquet output needs pyarrow (pip install pyarrow)')
+
+    columns = ['sensor_id', 'timestamp', 'value', 'status']
+    if args.labels:
+        columns.append('fault_type')
+
+    bounds = [(start, min(start + args.shard_rows, args.rows))
+              for start in range(0, args.rows, args.shard_rows)]
+    workers = max(1, min(args.workers, len(bounds)))
+
+    print(f"Generating {args.rows:,} rows for {args.sensors} sensors "
+          f"({len(bounds)} shards, {workers} workers, {fmt})...")
+    started = time.perf_counter()
+
+    plan = build_plan(args)
+    tmp_dir = tempfile.mkdtemp(prefix='.generate_', dir=out.parent)
+    try:
+        parts = [os.path.join(tmp_dir, f'part-{i:05d}') for i in range(len(bounds))]
+        jobs = [(i, start, stop, plan, args, fmt, parts[i]) for i, (start, stop) in enumerate(bounds)]
+
+        if workers == 1:
+            for job in jobs:
+                write_shard(*job)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for future in [pool.submit(write_shard, *job) for job in jobs]:
+                    future.result()
+
+        # Merge next to the parts and rename, so an interrupted run never
+        # leaves a truncated file under the real name
+        merged = os.path.join(tmp_dir, 'merged')
+        merge_parts(parts, merged, fmt, columns)
+        os.replace(merged, out)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {out} ({args.rows:,} rows in {elapsed:.1f}s, "
+          f"{args.rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
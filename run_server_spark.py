@@ -11,6 +11,8 @@ import sys
 import os
 import logging
 import signal
+import threading
+import time
 from pathlib import Path
 
 # Setup paths
@@ -24,6 +26,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Serializes Spark session creation between the warm-up thread, requests
+# (SparkConfig.get_status() also creates the session) and shutdown
+spark_lock = threading.Lock()
+warming_up = threading.Event()
+shutting_down = threading.Event()
+
+class SparkWarmingUpError(RuntimeError):
+    """Spark is still starting; served as 503 so callers retry later"""
+
 def setup_spark_environment():
     """Setup Spark environment variables if needed"""
     # Ensure Java is configured
@@ -35,6 +46,80 @@ def setup_spark_environment():
     os.environ.setdefault('SPARK_UI_PORT', '4040')
     logger.info(f"Spark Web UI will be available at http://localhost:{os.environ['SPARK_UI_PORT']}")
 
+def guard_spark_session(warmup_thread):
+    """Make SparkConfig.get_spark_session() build at most one session, never after shutdown
+    
+    While warmup_thread is building the session, other callers fail fast with
+    SparkWarmingUpError instead of tying up a server thread until it is done.
+    """
+    from app.spark_config import SparkConfig
+    get_spark_session = SparkConfig.get_spark_session
+    
+    def locked_get_spark_session(*args, **kwargs):
+        if warming_up.is_set() and threading.current_thread() is not warmup_thread:
+            if not spark_lock.acquire(blocking=False):
+                raise SparkWarmingUpError("Spark session is warming up, retry shortly")
+        else:
+            spark_lock.acquire()
+        try:
+            if shutting_down.is_set():
+                raise RuntimeError("Server is shutting down")
+            return get_spark_session(*args, **kwargs)
+        finally:
+            spark_lock.release()
+    
+    # NOTE: this belongs in SparkConfig (app/spark_config.py) itself. Until it
+    # locks session creation there, the launcher wraps the staticmethod here;
+    # that only covers callers that look it up through the class, as
+    # SparkConfig.get_status() does.
+    SparkConfig.get_spark_session = staticmethod(locked_get_spark_session)
+
+def stop_spark():
+    """Stop Spark now, or leave it to the warm-up thread if a session is being built"""
+    shutting_down.set()
+    if not spark_lock.acquire(blocking=False):
+        # Never wait here: a hung JVM start would make Ctrl+C useless. The
+        # warm-up thread stops the session once creation returns.
+        logger.info("Spark session still initializing - it will be stopped when ready")
+        return
+    try:
+        from app.spark_config import SparkConfig
+        SparkConfig.stop()
+    finally:
+        spark_lock.release()
+
+def warm_up_spark():
+    """Initialize the Spark session off the startup path"""
+    try:
+        logger.info("Initializing Spark session in background...")
+        start = time.perf_counter()
+        from app.spark_config import SparkConfig
+        try:
+            SparkConfig.get_spark_session()
+        finally:
+            warming_up.clear()
+        if shutting_down.is_set():
+            # Shutdown began mid-build and skipped stopping; do it now
+            stop_spark()
+            return
+        logger.info(f"✓ Spark session initialized in {time.perf_counter() - start:.2f}s")
+        
+        # Get status
+        status = SparkConfig.get_status()
+        logger.info("Spark Status:")
+        logger.info(f"  App ID: {status.get('app_id')}")
+        logger.info(f"  Version: {status.get('version')}")
+        logger.info(f"  Threads: {status.get('threads')}")
+    except Exception as e:
+        if shutting_down.is_set():
+            logger.info("Spark warm-up skipped, server is shutting down")
+        else:
+            logger.warning(f"Spark warm-up failed, pandas endpoints remain available: {e}")
+
+def spark_warming_up(error):
+    """503 response for requests that need Spark while it is still starting"""
+    return {'status': 'warming_up', 'error': str(error)}, 503, {'Retry-After': '5'}
+
 def main():
     """Main server startup function"""
     try:
@@ -47,21 +132,16 @@ def main():
         
         # Import Flask app
         logger.info("Loading Flask application...")
+        start = time.perf_counter()
         from app.main import app
-        logger.info("✓ Flask application loaded")
-        
-        # Pre-initialize Spark session
-        logger.info("Initializing Spark session...")
-        from app.spark_config import SparkConfig
-        spark = SparkConfig.get_spark_session()
-        logger.info("✓ Spark session initialized successfully")
+        logger.info(f"✓ Flask application loaded in {time.perf_counter() - start:.2f}s")
         
-        # Get status
-        status = SparkConfig.get_status()
-        logger.info(f"Spark Status:")
-        logger.info(f"  App ID: {status.get('app_id')}")
-        logger.info(f"  Version: {status.get('version')}")
-        logger.info(f"  Threads: {status.get('threads')}")
+        # Warm up Spark in the background so the server binds immediately
+        warmup_thread = threading.Thread(target=warm_up_spark, name='spark-warmup', daemon=True)
+        guard_spark_session(warmup_thread)
+        app.register_error_handler(SparkWarmingUpError, spark_warming_up)
+        warming_up.set()
+        warmup_thread.start()
         
         # Try waitress
         try:
@@ -80,7 +160,7 @@ def main():
         logger.info(f"  Dashboard:     http://{host}:{port}/")
         logger.info(f"  API:           http://{host}:{port}/sensors")
         logger.info(f"  Spark Status:  http://{host}:{port}/spark/status")
-        logger.info(f"  Spark Web UI:  http://localhost:4040")
+        logger.info(f"  Spark Web UI:  http://localhost:{os.environ['SPARK_UI_PORT']}")
         logger.info("="*70)
         logger.info("Press Ctrl+C to stop the server")
         logger.info("="*70 + "\n")
@@ -88,7 +168,8 @@ def main():
         # Graceful shutdown handler
         def signal_handler(signum, frame):
             logger.info("\nShutdown signal received, stopping server...")
-            SparkConfig.stop()
+            # Spark is stopped in the finally block below, without waiting on warm-up
+            shutting_down.set()
             sys.exit(0)
         
         signal.signal(signal.SIGINT, signal_handler)
@@ -109,8 +190,7 @@ def main():
     finally:
         # Cleanup
         try:
-            from app.spark_config import SparkConfig
-            SparkConfig.stop()
+            stop_spark()
         except:
             pass
 